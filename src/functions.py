@@ -1,57 +1,656 @@
+import hashlib
+import itertools
+import os
+import time
+from functools import wraps
+
+import numpy as np
 import pandas as pd
 import yfinance as yf
 
-def get_amount_and_value_from_description(x):
-    """Split string format: Koop [n] @ [x,y] EUR
+try:
+    import numba
+except ImportError:
+    numba = None
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+prange = numba.prange if numba is not None else range
+
+CACHE_DIR = 'cache'
+
+# Bump when the columns or dtypes of a cached DataFrame change
+CACHE_VERSION = 3
+
+# Text columns are stored in Arrow buffers when pyarrow is installed
+STRING_DTYPE = 'string[pyarrow]' if pyarrow is not None else 'string'
+
+# Excel exports above this size are read in chunks of CHUNK_ROWS rows
+CHUNKED_READ_SIZE = 20 * 1024 * 1024
+CHUNK_ROWS = 50000
+
+PRICE_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'degiro_analyser')
+PRICE_CACHE_EXPIRE = 24 * 60 * 60
+
+# Names of all columns of the Account export, the amounts have no header
+ACCOUNT_NAMES = ['Datum', 'Tijd', 'Valutadatum', 'Product', 'ISIN', 'Omschrijving',
+                 'FX', 'Mutatie_Valuta', 'Mutatie_Bedrag', 'Saldo_Valuta', 'Saldo_Bedrag',
+                 'Order_Id']
+
+# Columns of the Account export that are used, the others are not parsed
+ACCOUNT_COLUMNS = ['Datum', 'Tijd', 'Valutadatum', 'Product', 'Omschrijving',
+                   'FX', 'Mutatie_Valuta', 'Mutatie_Bedrag', 'Saldo_Valuta', 'Saldo_Bedrag']
+
+# Quantity and price of a purchase description: Koop [n] @ [x,y] EUR
+KOOP_PATTERN = r'Koop\s+([\d.,]+)\s+@\s+([\d.,]+)'
+
+DESCRIPTION_TYPES = ['Koop', 'Dividend', 'Corporate Action Kosten', 'Overig']
+
+def _parse_number(buffer, start, stop):
+    """Parse the bytes buffer[start:stop] as a float, where ',' is the decimal
+    separator and '.' the thousands separator. Returns nan if not a number.
+    """
+    if start >= stop:
+        return np.nan
+
+    number = 0.0
+    scale = 0.0
+    for j in range(start, stop):
+        c = buffer[j]
+        if c == 46:
+            continue
+        elif c == 44:
+            scale = 1.0
+        elif 48 <= c <= 57:
+            number = number * 10.0 + (c - 48)
+            if scale > 0.0:
+                scale *= 10.0
+        else:
+            return np.nan
+
+    if scale > 0.0:
+        return number / scale
+
+    return number
+
+def _parse_description_bytes(buffer, offsets, amounts, values):
+    """Fill amounts and values from descriptions Koop [n] @ [x,y] EUR stored
+    back to back in one UTF-8 buffer, where description i is
+    buffer[offsets[i]:offsets[i + 1]].
+    """
+    for i in prange(offsets.shape[0] - 1):
+        begin = offsets[i]
+        end = offsets[i + 1]
+        amounts[i] = np.nan
+        values[i] = np.nan
+        if (end - begin < 4 or buffer[begin] != 75 or buffer[begin + 1] != 111
+                or buffer[begin + 2] != 111 or buffer[begin + 3] != 112):
+            continue
+
+        # [n] runs from the first up to the second space
+        start = begin + 5
+        stop = start
+        while stop < end and buffer[stop] != 32:
+            stop += 1
+        amounts[i] = _parse_number(buffer, start, stop)
+
+        # skip ' @ ' to get to [x,y]
+        start = stop + 3
+        stop = start
+        while stop < end and buffer[stop] != 32:
+            stop += 1
+        values[i] = _parse_number(buffer, start, stop)
+
+if numba is not None:
+    _parse_number = numba.njit(cache=True)(_parse_number)
+    _parse_description_bytes = numba.njit(parallel=True, cache=True)(_parse_description_bytes)
+
+def get_amount_and_value_from_description(x, engine=None):
+    """Split string format: Koop [n] @ [x,y] EUR for a whole column of
+    descriptions at once.
 
     Parameters
     ----------
-    x : string
-        Koop [n] @ [x,y] EUR
+    x : Series
+        Descriptions of format: Koop [n] @ [x,y] EUR
+    engine : string, optional
+        'numba' to scan the descriptions as one byte buffer with a
+        JIT-compiled parser, or 'split' to use Series.str.split. Defaults
+        to 'numba' if numba is installed, which is the fastest
+
+    Returns
+    -------
+    DataFrame
+        Transaction_Quantity and Transaction_Amount of each description
+
+    Raises
+    ------
+    ValueError
+        If a description is not of the format Koop [n] @ [x,y] EUR
     """
-    index_amount = 1
-    index_value = 3
+    if engine is None:
+        engine = 'numba' if numba is not None else 'split'
 
-    x_split = x.split(' ')
-    amount = float(x_split[index_amount])
-    value = float(x_split[index_value].replace(',', '.'))
+    if engine == 'numba':
+        if numba is None:
+            raise ImportError("engine='numba' requires numba to be installed")
 
-    return [amount, value]
+        encoded = [d.encode() if isinstance(d, str) else b'' for d in x.to_numpy(dtype=object)]
+        offsets = np.zeros(len(encoded) + 1, dtype='int64')
+        np.cumsum([len(d) for d in encoded], out=offsets[1:])
+        buffer = np.frombuffer(b''.join(encoded), dtype='uint8')
 
-def read_account_overview(filename):
-    """Load Account export .xls from DeGiro, rename unnamed columns and
-    replace nan-values with zeros.
+        amount = np.empty(len(encoded), dtype='float64')
+        value = np.empty(len(encoded), dtype='float64')
+        _parse_description_bytes(buffer, offsets, amount, value)
+    else:
+        index_amount = 1
+        index_value = 3
+
+        # Drop the thousands separator and replace the decimal comma first
+        x_split = (x.str.replace('.', '', regex=False)
+                   .str.replace(',', '.', regex=False)
+                   .str.split(' ', n=index_value + 1))
+        amount = pd.to_numeric(x_split.str.get(index_amount), errors='coerce').to_numpy('float64', na_value=np.nan)
+        value = pd.to_numeric(x_split.str.get(index_value), errors='coerce').to_numpy('float64', na_value=np.nan)
+
+    # A NaN would propagate through every cumulative sum, so fail loudly
+    invalid = np.isnan(amount) | np.isnan(value)
+    if invalid.any():
+        raise ValueError(f'Cannot parse description: {x[invalid].iloc[0]!r}')
+
+    return pd.DataFrame({'Transaction_Quantity': amount,
+                         'Transaction_Amount': value},
+                        index=x.index)
+
+def _get_year_month(dates):
+    """Convert dates to monthly periods. These are stored as int64 ordinals,
+    so they are cheap to group and merge on, and print as YYYY-MM.
+
+    Parameters
+    ----------
+    dates : Series or DatetimeIndex
+        Datetimes to convert
+
+    Returns
+    -------
+    PeriodArray
+        Year-month of each date
+    """
+    return pd.DatetimeIndex(dates).to_period('M').array
+
+def _parse_dates(dates):
+    """Parse dates of the Account export, which are text of format dd-mm-yyyy
+    or date cells in Excel. The format only applies to text, so it is not
+    passed to the reader. Each unique date is parsed once and mapped back
+    onto all rows.
+
+    Parameters
+    ----------
+    dates : Series
+        Dates as read from the Account export
+
+    Returns
+    -------
+    Series
+        Datetimes of each date
+    """
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        return dates.astype('datetime64[ns]')
+
+    uniques = pd.Index(dates.unique())
+    text = np.array([isinstance(date, str) for date in uniques], dtype=bool)
+
+    parsed = np.full(len(uniques), np.datetime64('NaT'), dtype='datetime64[ns]')
+    if text.any():
+        parsed[text] = pd.to_datetime(uniques[text], format='%d-%m-%Y').to_numpy('datetime64[ns]')
+    if not text.all():
+        parsed[~text] = pd.to_datetime(uniques[~text]).to_numpy('datetime64[ns]')
+
+    return pd.Series(parsed[uniques.get_indexer(dates)], index=dates.index)
+
+def _get_description_type(descriptions):
+    """Classify each description once as Koop, Dividend, Corporate Action
+    Kosten or Overig, so later selections compare int8 category codes
+    instead of scanning the strings again.
+
+    Parameters
+    ----------
+    descriptions : Series
+        Omschrijving column of the Account export
+
+    Returns
+    -------
+    Categorical
+        Type of each description
+    """
+    conditions = [descriptions.str.startswith('Koop', na=False),
+                  descriptions.str.startswith('Dividend', na=False),
+                  descriptions.str.contains('Corporate Action Kosten', regex=False, na=False)]
+    conditions = [condition.to_numpy(dtype=bool) for condition in conditions]
+    codes = np.select(conditions, [0, 1, 2], default=3).astype('int8')
+
+    return pd.Categorical.from_codes(codes, DESCRIPTION_TYPES)
+
+def _parse_decimal_comma(value):
+    """Convert a text amount like 1.234,56 to a float, same as decimal=','
+    and thousands='.' in read_excel. Other values are returned as is.
+    """
+    if isinstance(value, str):
+        return float(value.replace('.', '').replace(',', '.'))
+
+    return value
+
+def _read_excel_chunked(filename, names, usecols, dtype):
+    """Read the first sheet of a large Excel export row by row with
+    python-calamine, converting CHUNK_ROWS rows at a time to typed columns,
+    so the whole sheet never exists as Python objects at once.
 
     Parameters
     ----------
     filename : string
         filename of Account.xls from DeGiro website
+    names : list of string
+        Names of all columns in the sheet
+    usecols : list of string
+        Names of the columns to keep
+    dtype : dict
+        Type of each column
 
     Returns
     -------
     DataFrame
+        Raw content of the Account export
+    """
+    from python_calamine import CalamineWorkbook
+
+    # Categories can differ per chunk, so these are converted after concat
+    chunk_dtype = {column: t for column, t in dtype.items() if t != 'category'}
+    categories = {column: t for column, t in dtype.items() if t == 'category'}
+    numbers = [column for column, t in chunk_dtype.items() if t.startswith('float')]
+
+    chunks = []
+    with CalamineWorkbook.from_path(filename) as workbook:
+        rows = workbook.get_sheet_by_index(0).iter_rows()
+        next(rows)  # header
+
+        while True:
+            chunk = [row[:len(names)] for row in itertools.islice(rows, CHUNK_ROWS)]
+            if not chunk:
+                break
+
+            df = pd.DataFrame.from_records(chunk, columns=names)[usecols].replace({'': None})
+            for column in numbers:
+                df[column] = df[column].map(_parse_decimal_comma)
+            chunks.append(df.astype(chunk_dtype))
+
+    return pd.concat(chunks, ignore_index=True).astype(categories)
+
+def _read_account_file(filename, **kwargs):
+    """Read Account export from DeGiro with the fastest parser for its
+    file type: the C engine for .csv and calamine for .xls(x). Falls back to
+    the default pandas engine if calamine is not installed. Excel files above
+    CHUNKED_READ_SIZE are read in chunks.
+
+    Parameters
+    ----------
+    filename : string
+        filename of Account.xls or Account.csv from DeGiro website
+
+    Returns
+    -------
+    DataFrame
+        Raw content of the Account export
+    """
+    # The pyarrow CSV engine does not support thousands, which DeGiro uses
+    if filename.lower().endswith('.csv'):
+        return pd.read_csv(filename, decimal=',', thousands='.', **kwargs)
+
+    try:
+        if os.path.getsize(filename) > CHUNKED_READ_SIZE:
+            return _read_excel_chunked(filename, kwargs['names'], kwargs['usecols'], kwargs['dtype'])
+
+        return pd.read_excel(filename, engine='calamine', decimal=',', thousands='.', **kwargs)
+    except ImportError:
+        return pd.read_excel(filename, decimal=',', thousands='.', **kwargs)
+
+def _sort_on_datum(df_account):
+    """Sort the Account transactions on Datum, unless they already are. DeGiro
+    exports newest first, which only needs to be reversed.
+    """
+    if df_account['Datum'].is_monotonic_increasing:
+        return df_account
+
+    if df_account['Datum'].is_monotonic_decreasing:
+        return df_account.iloc[::-1].reset_index(drop=True)
+
+    return df_account.sort_values('Datum', kind='stable', ignore_index=True)
+
+def _parquet_cache(dtype):
+    """Cache the DataFrame that the decorated function returns for a file as
+    Parquet in CACHE_DIR, keyed on CACHE_VERSION and path, modification time
+    and size of the file, so an unchanged file is never parsed twice.
+    Parquet does not keep every pandas dtype, so the columns in dtype are
+    converted back after reading. Requires pyarrow, otherwise the file is
+    parsed on every call.
+
+    Parameters
+    ----------
+    dtype : dict
+        Type of the columns to restore after reading from the cache
+    """
+    def decorator(function):
+        @wraps(function)
+        def wrapper(filename):
+            if pyarrow is None:
+                return function(filename)
+
+            stat = os.stat(filename)
+            key = repr((CACHE_VERSION, function.__name__, os.path.abspath(filename),
+                        stat.st_mtime_ns, stat.st_size))
+            cache_path = os.path.join(CACHE_DIR, hashlib.sha1(key.encode()).hexdigest() + '.parquet')
+
+            if os.path.exists(cache_path):
+                return pd.read_parquet(cache_path, engine='pyarrow').astype(dtype)
+
+            df = function(filename)
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            df.to_parquet(cache_path, engine='pyarrow', compression='zstd')
+
+            return df
+
+        return wrapper
+
+    return decorator
+
+@_parquet_cache(dtype={'Tijd': STRING_DTYPE, 'Omschrijving': STRING_DTYPE})
+def read_account_overview(filename):
+    """Load Account export .xls or .csv from DeGiro, rename unnamed columns and
+    replace nan-values with zeros. The result is cached as Parquet until the
+    file changes.
+
+    Parameters
+    ----------
+    filename : string
+        filename of Account.xls or Account.csv from DeGiro website
+
+    Returns
+    -------
+    DataFrame
+        Account transactions of shares sorted on Datum
+    """
+    return (_read_account_file(filename,
+                               header=0,
+                               names=ACCOUNT_NAMES,
+                               usecols=ACCOUNT_COLUMNS,
+                               dtype={'Mutatie_Bedrag': 'float32',
+                                      'Saldo_Bedrag': 'float32',
+                                      'FX': 'float32',
+                                      'Omschrijving': STRING_DTYPE,
+                                      'Tijd': STRING_DTYPE,
+                                      'Mutatie_Valuta': 'category',
+                                      'Saldo_Valuta': 'category'})
+            .fillna({'Mutatie_Bedrag': 0, 'Product': ''})
+            .assign(Datum=lambda df: _parse_dates(df['Datum']),
+                    Valutadatum=lambda df: _parse_dates(df['Valutadatum']),
+                    Datum_Year=lambda df: df['Datum'].dt.year,
+                    Datum_Year_Month=lambda df: _get_year_month(df['Datum']),
+                    Product=lambda df: df['Product'].astype('category'),
+                    Omschrijving_Type=lambda df: _get_description_type(df['Omschrijving']))
+            .pipe(_sort_on_datum))
+
+def read_account_overview_polars(filename):
+    """Load Account export .xls or .csv from DeGiro into a Polars DataFrame
+    and rename unnamed columns. Requires polars.
+
+    Parameters
+    ----------
+    filename : string
+        filename of Account.xls or Account.csv from DeGiro website
+
+    Returns
+    -------
+    polars.DataFrame
         Account transactions of shares
     """
-    df_account = pd.read_excel(filename,
-                               decimal=',',
-                               thousands='.')
+    import polars as pl
+
+    if filename.lower().endswith('.csv'):
+        # Read as text, the amounts have both a decimal comma and '.' thousands
+        df_account = pl.read_csv(filename, infer_schema=False)
+    else:
+        df_account = pl.read_excel(filename, engine='calamine')
 
-    columns_dict = {'Mutatie': 'Mutatie_Valuta',
-                    'Unnamed: 8': 'Mutatie_Bedrag',
-                    'Saldo': 'Saldo_Valuta',
-                    'Unnamed: 10': 'Saldo_Bedrag'}
+    # The amounts have no header in the export, so rename by position
+    columns = ['Mutatie_Valuta', 'Mutatie_Bedrag', 'Saldo_Valuta', 'Saldo_Bedrag']
+    df_account = df_account.rename(dict(zip(df_account.columns[7:11], columns)))
 
-    df_account.rename(columns=columns_dict, inplace=True)
+    def to_float(column):
+        if df_account.schema[column] != pl.String:
+            return pl.col(column).cast(pl.Float64)
 
-    df_account['Datum'] = pd.to_datetime(df_account['Datum'], infer_datetime_format=True)
-    df_account['Datum_Year'] = df_account['Datum'].dt.year
-    df_account['Mutatie_Bedrag'].fillna(0, inplace=True)
-    df_account['Product'].fillna('', inplace=True)
+        return (pl.col(column)
+                .replace('', None)
+                .str.replace_all('.', '', literal=True)
+                .str.replace(',', '.', literal=True)
+                .cast(pl.Float64))
 
-    return df_account
+    def to_date(column):
+        if df_account.schema[column] != pl.String:
+            return pl.col(column).cast(pl.Date)
+
+        return pl.col(column).replace('', None).str.to_date('%d-%m-%Y')
+
+    # Match the schema of read_account_overview, whatever cells the export has
+    df_account = df_account.with_columns(to_float('Mutatie_Bedrag'), to_float('FX'), to_float('Saldo_Bedrag'),
+                                         to_date('Datum'), to_date('Valutadatum'))
+
+    return df_account.with_columns(pl.col('Datum').dt.year().alias('Datum_Year'),
+                                   pl.col('Mutatie_Bedrag').fill_null(0),
+                                   pl.col('Product').fill_null(''),
+                                   pl.col('Mutatie_Valuta', 'Saldo_Valuta').cast(pl.Categorical))
+
+def get_transactions_polars(df_account, product):
+    """Get all purchases of product with cumulative quantity and total as a
+    single lazy Polars query.
+
+    Parameters
+    ----------
+    df_account : polars.DataFrame
+        Account transactions from read_account_overview_polars
+    product : string
+        (Part of) the name of the product
+
+    Returns
+    -------
+    polars.DataFrame
+        Purchases of product sorted on Datum
+    """
+    import polars as pl
+
+    def extract(index):
+        return (pl.col('Omschrijving')
+                .str.extract(KOOP_PATTERN, index)
+                .str.replace_all('.', '', literal=True)
+                .str.replace(',', '.', literal=True)
+                .cast(pl.Float64))
+
+    # Same order as _sort_on_datum: a newest-first export is only reversed
+    if not df_account['Datum'].is_sorted() and df_account['Datum'].is_sorted(descending=True):
+        df_account = df_account.reverse()
+
+    return (df_account.lazy()
+            .filter(pl.col('Product').str.contains(product, literal=True)
+                    & pl.col('Omschrijving').str.starts_with('Koop'))
+            .sort('Datum', maintain_order=True)
+            .with_columns(extract(1).alias('Transaction_Quantity'),
+                          extract(2).alias('Transaction_Amount'))
+            .with_columns((pl.col('Transaction_Quantity') * pl.col('Transaction_Amount')).alias('Transaction_Total'))
+            .with_columns(pl.col('Transaction_Quantity').cum_sum().alias('Transaction_Quantity_cumulative'),
+                          pl.col('Transaction_Total').cum_sum().alias('Transaction_Total_Cum'))
+            .collect())
+
+def get_fx_for_dividends_from_account(df_account):
+    """Get the FX rate of the Valuta Debitering for each Valutadatum. An
+    account can hold several debiteringen on the same Valutadatum, only the
+    last one is kept.
+
+    Parameters
+    ----------
+    df_account : DataFrame
+        Account transactions from read_account_overview
+
+    Returns
+    -------
+    Series
+        FX rate indexed by Valutadatum
+    """
+    mask1 = df_account['Omschrijving'].str.startswith('Valuta Debitering', na=False)
+    mask2 = df_account['FX'].notna()
+
+    df_fx = (df_account[mask1 & mask2][['Valutadatum', 'FX']]
+             .drop_duplicates('Valutadatum', keep='last')
+             .set_index('Valutadatum')
+             .sort_index())
+
+    return df_fx['FX']
+
+def get_transactions(df_account):
+    """Get all purchases (Koop) sorted on Datum, with quantity, amount and
+    total of each purchase and the cumulative quantity and total.
+
+    Parameters
+    ----------
+    df_account : DataFrame
+        Account transactions from read_account_overview
+
+    Returns
+    -------
+    DataFrame
+        Purchases sorted on Datum
+    """
+    # read_account_overview already sorted the rows on Datum
+    transactions = df_account[df_account['Omschrijving_Type'] == 'Koop']
+    parts = get_amount_and_value_from_description(transactions['Omschrijving'])
+
+    # Prices of several thousands with cents need more digits than float32
+    quantity = parts['Transaction_Quantity'].to_numpy()
+    amount = parts['Transaction_Amount'].to_numpy()
+    total = quantity * amount
+
+    return pd.DataFrame({'Datum': transactions['Datum'].array,
+                         'Product': transactions['Product'].array,
+                         'Mutatie_Valuta': transactions['Mutatie_Valuta'].array,
+                         'Transaction_Quantity': quantity,
+                         'Transaction_Amount': amount,
+                         'Transaction_Quantity_cumulative': np.cumsum(quantity),
+                         'Transaction_Total': total,
+                         'Transaction_Total_Cum': np.cumsum(total)},
+                        index=transactions.index)
+
+def dividends(df_account):
+    """Get the paid-out dividends together with their DEGIRO Corporate Action
+    Kosten (CAK) and FX rate. The CAK of a dividend is booked with the same
+    Product and Valutadatum, and each CAK is matched to one dividend only.
+
+    Parameters
+    ----------
+    df_account : DataFrame
+        Account transactions from read_account_overview
+
+    Returns
+    -------
+    DataFrame
+        Dividends with the matched CAK in CAK_Bedrag (zero if unmatched) and
+        the FX rate of their Valutadatum
+    """
+    columns = ['Datum', 'Datum_Year', 'Valutadatum', 'Product', 'Mutatie_Valuta', 'Mutatie_Bedrag']
+    keys = ['Product', 'Valutadatum', 'Number']
+
+    df_dividend = df_account[(df_account['Omschrijving_Type'] == 'Dividend')
+                             & (df_account['Mutatie_Bedrag'] > 0)][columns].dropna(subset=['Valutadatum'])
+    df_cak = df_account[df_account['Omschrijving_Type'] == 'Corporate Action Kosten'].dropna(subset=['Valutadatum'])
+    df_cak = df_cak[['Valutadatum', 'Product', 'Mutatie_Bedrag']].rename(columns={'Mutatie_Bedrag': 'CAK_Bedrag'})
+
+    # Number the dividends and CAK of a Product and Valutadatum, so the n-th
+    # dividend only gets the n-th CAK and no CAK is charged twice
+    df_dividend = df_dividend.assign(Number=df_dividend.groupby(['Product', 'Valutadatum'], observed=True).cumcount())
+    df_cak = df_cak.assign(Number=df_cak.groupby(['Product', 'Valutadatum'], observed=True).cumcount())
+
+    df_dividend = df_dividend.merge(df_cak, on=keys, how='left').drop(columns='Number')
+    df_dividend['CAK_Bedrag'] = df_dividend['CAK_Bedrag'].fillna(0)
+    df_dividend['FX'] = df_dividend['Valutadatum'].map(get_fx_for_dividends_from_account(df_account))
+
+    return df_dividend
+
+def get_start_datetime(earliest_date):
+    """Get the first day of the month of earliest_date, as start date of a
+    monthly share price history. Works on a single date or an array of
+    dates at once.
+
+    Parameters
+    ----------
+    earliest_date : Timestamp or array of datetime64
+        Date(s) of the earliest transaction
+
+    Returns
+    -------
+    Timestamp or ndarray
+        First day of the month of each date
+    """
+    if np.ndim(earliest_date) == 0:
+        return pd.Timestamp(earliest_date).normalize().replace(day=1)
+
+    return np.asarray(earliest_date, dtype='datetime64[M]').astype('datetime64[D]')
+
+_PRICE_HISTORIES = {}
+
+def _download_share_price_history(ticker, startdate, enddate):
+    """Download Closed share price of ticker once per (ticker, start, end),
+    reusing a Parquet copy in PRICE_CACHE_DIR for up to a day. A failed or
+    empty download is not cached, so the next call tries again.
+    """
+    key = (ticker, str(startdate), str(enddate))
+    if key in _PRICE_HISTORIES:
+        return _PRICE_HISTORIES[key]
+
+    cache_key = repr((CACHE_VERSION,) + key)
+    cache_path = os.path.join(PRICE_CACHE_DIR, hashlib.sha1(cache_key.encode()).hexdigest() + '.parquet')
+
+    if (pyarrow is not None and os.path.exists(cache_path)
+            and time.time() - os.path.getmtime(cache_path) < PRICE_CACHE_EXPIRE):
+        prices = pd.read_parquet(cache_path, engine='pyarrow')
+        _PRICE_HISTORIES[key] = prices
+        return prices
+
+    close = yf.download(tickers=ticker, start=startdate, end=enddate)['Close']
+    # yfinance names the close column after the ticker, which is renamed to
+    # Close as in get_share_price_histories
+    if isinstance(close, pd.DataFrame):
+        close = close.iloc[:, 0] if close.shape[1] else pd.Series(index=close.index, dtype='float64')
+
+    # The dates are the index, a failed download has no Date column to reset
+    prices = pd.DataFrame({'Date': close.index.astype('datetime64[ns]'),
+                           'Close': close.to_numpy(),
+                           'Datum_Year_Month': _get_year_month(close.index)})
+
+    if prices.empty:
+        return prices
+
+    _PRICE_HISTORIES[key] = prices
+    if pyarrow is not None:
+        os.makedirs(PRICE_CACHE_DIR, exist_ok=True)
+        prices.to_parquet(cache_path, engine='pyarrow')
+
+    return prices
 
 def get_share_price_history(ticker, startdate, enddate):
-    """Get Closed share price of ticker between start and enddate
+    """Get Closed share price of ticker between start and enddate. Repeated
+    calls with the same arguments are served from memory, and from disk for
+    a day across sessions.
 
     Parameters
     ----------
@@ -65,13 +664,34 @@ def get_share_price_history(ticker, startdate, enddate):
     Returns
     -------
     DataFrame
-        Share prices for each date between start and end
+        Share prices in Close for each Date between start and end, with
+        the Datum_Year_Month key of read_account_overview
     """
-    prices = yf.download(tickers=ticker, start=startdate, end=enddate)['Close']
-    prices = pd.DataFrame(prices)
-    prices.reset_index(inplace=True)
+    return _download_share_price_history(ticker, startdate, enddate).copy()
 
-    return prices
+def get_share_price_histories(tickers, startdate, enddate):
+    """Get Closed share prices of several tickers between start and enddate
+    with a single threaded download.
 
+    Parameters
+    ----------
+    tickers : list of string
+        Ticker symbols of shares on stock exchange
+    startdate : Timestamp
+        Datetime of starting date of share price
+    enddate : Timestamp
+        Datetime of ending date of share price
 
+    Returns
+    -------
+    dict
+        Share prices per ticker, with the columns of get_share_price_history
+    """
+    prices = yf.download(tickers=list(tickers), start=startdate, end=enddate,
+                         group_by='ticker', threads=True, progress=False)
+    year_month = _get_year_month(prices.index)
 
+    return {ticker: pd.DataFrame({'Date': prices.index.astype('datetime64[ns]'),
+                                  'Close': prices[ticker]['Close'].to_numpy(),
+                                  'Datum_Year_Month': year_month}).dropna(subset=['Close'])
+            for ticker in tickers}
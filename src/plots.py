@@ -1,6 +1,156 @@
+import os
+
+import matplotlib
+
+# Render without GUI event loop, e.g. when saving plots of many products
+HEADLESS = os.environ.get('DEGIRO_HEADLESS', '0') == '1'
+if HEADLESS:
+    matplotlib.use('Agg')
+
+import matplotlib.dates as mdates
 import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.collections import LineCollection
+from matplotlib.ticker import FuncFormatter
+
+try:
+    from tsdownsample import LTTBDownsampler
+except ImportError:
+    LTTBDownsampler = None
+
+currency_symbols = {'EUR': '\u20ac', 'USD': '$', 'GBP': '\u00a3'}
+
+def _get_currency_formatter(currency):
+    """Get tick formatter for amounts in currency. Ticks are whole amounts,
+    or with cents if the ticks are less than one apart. A formatter is
+    bound to the axis it is set on, so a new one is created for every axis.
+
+    Parameters
+    ----------
+    currency : string
+        Currency code of the amounts
+
+    Returns
+    -------
+    FuncFormatter
+        Formats ticks as amounts with the currency symbol
+    """
+    symbol = currency_symbols.get(currency, currency + ' ')
+
+    def format_tick(x, pos):
+        locs = formatter.locs
+        decimals = 2 if len(locs) > 1 and abs(locs[1] - locs[0]) < 1 else 0
+        return f'{symbol}{x:,.{decimals}f}'
+
+    formatter = FuncFormatter(format_tick)
+
+    return formatter
+
+def _maybe_downsample(x, y, max_points=2000):
+    """Reduce x and y to max_points with Largest-Triangle-Three-Buckets if
+    there are more points than can be seen in a figure. Requires
+    tsdownsample, otherwise x and y are returned as is.
+
+    Parameters
+    ----------
+    x : ndarray
+        Sorted date ordinals
+    y : ndarray
+        Values at each date
+    max_points : int
+        Maximum number of points to plot
+
+    Returns
+    -------
+    tuple of ndarray
+        Downsampled x and y
+    """
+    if LTTBDownsampler is None or len(x) <= max_points:
+        return x, y
+
+    index = LTTBDownsampler().downsample(x, y, n_out=max_points)
+
+    return x[index], y[index]
+
+def _plot_line_with_markers(ax, x, y, color):
+    """Plot y as function of dates x with one LineCollection for the line
+    segments and one scatter for the markers, instead of a Line2D per call.
+
+    Parameters
+    ----------
+    ax : Axes
+        Axes to plot on
+    x : ndarray
+        Date ordinals from matplotlib.dates.date2num
+    y : Series
+        Values at each date
+    color : string
+        Color of line and markers
+    """
+    y = np.asarray(y, dtype='float64')
+    x, y = _maybe_downsample(x, y)
 
-def plot_dividend(x, y1, y2, currency):
+    points = np.column_stack((x, y))
+    segments = np.stack((points[:-1], points[1:]), axis=1)
+
+    ax.add_collection(LineCollection(segments, colors=color))
+    ax.scatter(x, y, color=color)
+    ax.autoscale_view()
+
+def plot_metric_and_cum_metric(x, y1, y2, currency, label, ax=None, filename=None):
+    """Plot metric and cumulative metric as function of time on twin y-axes.
+
+    Parameters
+    ----------
+    x : Series
+        Date of each value
+    y1 : Series
+        Value of metric per time unit
+    y2 : Series
+        Cumulative of metric
+    currency : string
+        Currency of metric
+    label : string
+        Name of metric on the y-axes
+    ax : Axes, optional
+        Axes to plot on, a new figure is created if not given
+    filename : string, optional
+        Save the figure to filename
+
+    Returns
+    -------
+    Figure
+        Figure that is plotted on
+    """
+    if ax is None:
+        fig, ax1 = plt.subplots()
+    else:
+        fig, ax1 = ax.figure, ax
+
+    # Convert the dates once for both axes
+    x = mdates.date2num(np.asarray(x))
+
+    ax2 = ax1.twinx()
+    _plot_line_with_markers(ax1, x, y1, 'g')
+    _plot_line_with_markers(ax2, x, y2, 'b')
+    locator = mdates.AutoDateLocator()
+    ax1.xaxis.set_major_locator(locator)
+    ax1.xaxis.set_major_formatter(mdates.ConciseDateFormatter(locator))
+    ax1.set_xlabel('Datum')
+    ax1.set_ylabel(label + ' (' + currency + ')', color='g')
+    ax2.set_ylabel(label + ' Cum (' + currency + ')', color='b')
+    ax1.yaxis.set_major_formatter(_get_currency_formatter(currency))
+    ax2.yaxis.set_major_formatter(_get_currency_formatter(currency))
+    ax1.tick_params(labelrotation=45)
+
+    if filename is not None:
+        fig.savefig(filename)
+    if HEADLESS and ax is None:
+        plt.close(fig)
+
+    return fig
+
+def plot_dividend(x, y1, y2, currency, ax=None, filename=None):
     """Plot dividend and cumulative dividend as function of time.
     Does NOT include DEGIRO Corporate Action Cost nor FX rate conversion.
 
@@ -14,17 +164,19 @@ def plot_dividend(x, y1, y2, currency):
         Cumulative of dividend paid-out
     currency : string
         Currency in which dividend is paid out
+    ax : Axes, optional
+        Axes to plot on, a new figure is created if not given
+    filename : string, optional
+        Save the figure to filename
+
+    Returns
+    -------
+    Figure
+        Figure that is plotted on
     """
-    fig, ax1 = plt.subplots()
-    ax2 = ax1.twinx()
-    ax1.plot(x, y1, 'o-', color='g')
-    ax2.plot(x, y2, 'o-', color='b')
-    ax1.set_xlabel('Datum')
-    ax1.set_ylabel('Dividend (' + currency + ')', color='g')
-    ax2.set_ylabel('Dividend Cum (' + currency + ')', color='b')
-    ax1.tick_params(labelrotation=45)
+    return plot_metric_and_cum_metric(x, y1, y2, currency, 'Dividend', ax=ax, filename=filename)
 
-def plot_transactions(x, y1, y2, currency):
+def plot_transactions(x, y1, y2, currency, ax=None, filename=None):
     """Plot transactions of shares and cumulative transactions as function of time.
 
     Parameters
@@ -37,12 +189,14 @@ def plot_transactions(x, y1, y2, currency):
         Cumulative transactions of each shares
     currency : string
         Currency in which share is purchased
+    ax : Axes, optional
+        Axes to plot on, a new figure is created if not given
+    filename : string, optional
+        Save the figure to filename
+
+    Returns
+    -------
+    Figure
+        Figure that is plotted on
     """
-    fig, ax1 = plt.subplots()
-    ax2 = ax1.twinx()
-    ax1.plot(x, y1, 'o-', color='g')
-    ax2.plot(x, y2, 'o-', color='b')
-    ax1.set_xlabel('Datum')
-    ax1.set_ylabel('Aankopen (' + currency + ')', color='g')
-    ax2.set_ylabel('Aankopen Cum (' + currency + ')', color='b')
-    ax1.tick_params(labelrotation=45)
+    return plot_metric_and_cum_metric(x, y1, y2, currency, 'Aankopen', ax=ax, filename=filename)
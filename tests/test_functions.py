@@ -0,0 +1,72 @@
+import pandas as pd
+import pytest
+
+import src.functions as functions
+
+ACCOUNT_CSV = '''Datum,Tijd,Valutadatum,Product,ISIN,Omschrijving,FX,Mutatie,,Saldo,,Order Id
+03-03-2021,10:00,02-03-2021,VANGUARD FTSE ALL-WORLD,IE00B3RBWM25,Dividend,,USD,"12,34",USD,"1.234,56",
+02-03-2021,09:00,01-03-2021,VANGUARD FTSE ALL-WORLD,IE00B3RBWM25,"Koop 3 @ 1.234,56 EUR",,EUR,"-3.703,68",EUR,"1.222,22",abc
+01-03-2021,09:00,01-03-2021,,,iDEAL storting,,,,EUR,"4.925,90",
+'''
+
+def test_read_account_overview_csv(tmp_path, monkeypatch):
+    monkeypatch.setattr(functions, 'CACHE_DIR', str(tmp_path / 'cache'))
+    filename = tmp_path / 'Account.csv'
+    filename.write_text(ACCOUNT_CSV)
+
+    df_account = functions.read_account_overview(str(filename))
+
+    assert list(df_account['Datum']) == list(pd.to_datetime(['2021-03-01', '2021-03-02', '2021-03-03']))
+    assert list(df_account['Mutatie_Bedrag']) == pytest.approx([0, -3703.68, 12.34])
+    assert list(df_account['Saldo_Bedrag']) == pytest.approx([4925.90, 1222.22, 1234.56])
+    assert list(df_account['Mutatie_Valuta'].astype(object).fillna('')) == ['', 'EUR', 'USD']
+    assert list(df_account['Omschrijving_Type']) == ['Overig', 'Koop', 'Dividend']
+
+def test_read_account_overview_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(functions, 'CACHE_DIR', str(tmp_path / 'cache'))
+    filename = tmp_path / 'Account.csv'
+    filename.write_text(ACCOUNT_CSV)
+
+    df_account = functions.read_account_overview(str(filename))
+    df_cached = functions.read_account_overview(str(filename))
+
+    pd.testing.assert_frame_equal(df_account, df_cached)
+
+@pytest.mark.parametrize('engine', ['split', pytest.param('numba', marks=pytest.mark.skipif(
+    functions.numba is None, reason='requires numba'))])
+def test_get_amount_and_value_from_description(engine):
+    descriptions = pd.Series(['Koop 3 @ 1.234,56 EUR', 'Koop 1.000 @ 12,5 USD'])
+    parts = functions.get_amount_and_value_from_description(descriptions, engine=engine)
+    assert parts['Transaction_Quantity'].tolist() == [3, 1000]
+    assert parts['Transaction_Amount'].tolist() == pytest.approx([1234.56, 12.5])
+
+    with pytest.raises(ValueError):
+        functions.get_amount_and_value_from_description(pd.Series(['Koop 3 @ abc EUR']), engine=engine)
+
+DIVIDEND_CSV = '''Datum,Tijd,Valutadatum,Product,ISIN,Omschrijving,FX,Mutatie,,Saldo,,Order Id
+15-06-2021,10:00,14-06-2021,VANGUARD FTSE ALL-WORLD,IE00B3RBWM25,DEGIRO Corporate Action Kosten,,USD,"-1,37",USD,"13,21",
+15-06-2021,10:00,14-06-2021,VANGUARD FTSE ALL-WORLD,IE00B3RBWM25,Dividend,,USD,"12,34",USD,"14,58",
+03-03-2021,10:00,02-03-2021,VANGUARD FTSE ALL-WORLD,IE00B3RBWM25,Dividend,,USD,"2,24",USD,"2,24",
+'''
+
+def test_dividends(tmp_path, monkeypatch):
+    monkeypatch.setattr(functions, 'CACHE_DIR', str(tmp_path / 'cache'))
+    filename = tmp_path / 'Account.csv'
+    filename.write_text(DIVIDEND_CSV)
+
+    df_dividend = functions.dividends(functions.read_account_overview(str(filename)))
+
+    assert list(df_dividend['Valutadatum']) == list(pd.to_datetime(['2021-03-02', '2021-06-14']))
+    assert list(df_dividend['CAK_Bedrag']) == pytest.approx([0, -1.37])
+
+def test_get_transactions_keeps_cents():
+    df_account = pd.DataFrame({'Datum': pd.to_datetime(['2021-03-01', '2021-03-02']),
+                               'Product': ['VANGUARD FTSE ALL-WORLD'] * 2,
+                               'Mutatie_Valuta': ['EUR'] * 2,
+                               'Omschrijving': ['Koop 333 @ 12.345,67 EUR', 'Koop 7 @ 1.234,56 EUR'],
+                               'Omschrijving_Type': ['Koop'] * 2})
+
+    transactions = functions.get_transactions(df_account)
+
+    assert list(transactions['Transaction_Total']) == pytest.approx([4111108.11, 8641.92], abs=1e-6)
+    assert transactions['Transaction_Total_Cum'].iloc[-1] == pytest.approx(4119750.03, abs=1e-6)